@@ -6,83 +6,134 @@
 
 import asyncio, nest_asyncio # Required for asynchronous code. 
 from bleak import BleakClient, BleakScanner # Used for communications with Circuit Cube over Bluetooth Low Energy (BLE). 
-import math # Used only once for rounding velocity magnitude in motor_command function. 
+from bleak.exc import BleakError # Raised by bleak for transient BLE failures, which are retried. 
 import sys # Used only once in platform function to identify operating system. 
-from IPython import get_ipython # Use only once in initializing Cube class to check for interative Python environment. 
+try: 
+    from IPython import get_ipython # Used only once, when the module is imported, to check for interactive Python environment. 
+    _IN_JUPYTER = get_ipython() is not None
+except ImportError: 
+    _IN_JUPYTER = False
+try: 
+    import uvloop # Optional, faster event loop used on Linux and macOS when installed. 
+except ImportError: 
+    uvloop = None
 
 class Constants: # Class for storing and managing BLE information, mainly Bluetooth address, and TX/RX characteristic UUIDs. 
 
     __version__ = '1.1.3' # Remember to update. 
 
+    __slots__ = ('bluetooth_address',) # Address is the only per-Cube value, so it is the only instance attribute. 
+
+    CIRCUITCUBE_SERV = '6e400001-b5a3-f393-e0a9-e50e24dcca9e'
+    TX_CHAR = '6e400002-b5a3-f393-e0a9-e50e24dcca9e' # Write-without-response. 
+    RX_CHAR = '6e400003-b5a3-f393-e0a9-e50e24dcca9e' # Notify. 
+    RX_CLIENT_CHAR_CONFIG_DESC = '00002902-0000-1000-8000-00805f9b34fb' # Handle 34. 
+
+    GAP_SERV = '00001800-0000-1000-8000-00805f9b34fb'
+    DEVICE_NAME_CHAR = '00002a00-0000-1000-8000-00805f9b34fb' # Read. 
+    APPEARANCE_CHAR = '00002a01-0000-1000-8000-00805f9b34fb' # Read. 
+    PERIPHERAL_PRIVACY_CHAR = '00002a02-0000-1000-8000-00805f9b34fb' # Read. 
+
+    GATT_SERV = '00001801-0000-1000-8000-00805f9b34fb' 
+    SERVICE_CHANGED_CHAR = '00002a05-0000-1000-8000-00805f9b34fb' # Indicate. 
+    GATT_CLIENT_CHAR_CONFIG_DESC = '00002902-0000-1000-8000-00805f9b34fb' # Handle 11. 
+
+    DEVICE_INFORMATION_SERV = '0000180a-0000-1000-8000-00805f9b34fb'
+    SYSTEM_ID_CHAR = '00002a23-0000-1000-8000-00805f9b34fb' # Read. 
+    MODEL_NUMBER_STR_CHAR = '00002a24-0000-1000-8000-00805f9b34fb' # Read. 
+    SERIAL_NUMBER_STR_CHAR = '00002a25-0000-1000-8000-00805f9b34fb' # Read. 
+    FIRMWARE_REV_STR_CHAR = '00002a26-0000-1000-8000-00805f9b34fb' # Read. 
+    HARDWARE_REV_STR_CHAR = '00002a27-0000-1000-8000-00805f9b34fb' # Read. 
+    SOFTWARE_REV_STR_CHAR = '00002a28-0000-1000-8000-00805f9b34fb' # Read. 
+    MANUFACTURER_STR_CHAR = '00002a29-0000-1000-8000-00805f9b34fb' # Read. 
+    IEEE_REGULATORY_LIST_CHAR = '00002a2a-0000-1000-8000-00805f9b34fb' # Read. 
+    PLUGNPLAY_ID_CHAR = '00002a50-0000-1000-8000-00805f9b34fb' # Read. 
+
+    UNKNOWN_SERV = 'f000ffc0-0451-4000-b000-000000000000'
+    UNKNOWN_CHAR_1 = 'f000ffc1-0451-4000-b000-000000000000' # write-without-response, write, notify. 
+    UNKNOWN_DESC_1 = '00002902-0000-1000-8000-00805f9b34fb' # Handle 4099.
+    UNKNOWN_DESC_2 = '00002901-0000-1000-8000-00805f9b34fb' # Handle: 4100.
+    UNKNOWN_CHAR_2 = 'f000ffc2-0451-4000-b000-000000000000' # write-without-response, write, notify. 
+    UNKNOWN_DESC_3 = '00002902-0000-1000-8000-00805f9b34fb' # Handle 4103. 
+    UNKNOWN_DESC_4 = '00002901-0000-1000-8000-00805f9b34fb' # Handle: 4104.
+
+    _CONSTANTS = ('', # 0, placeholder for the Bluetooth address, which is stored per instance. 
+                  CIRCUITCUBE_SERV, TX_CHAR, RX_CHAR, RX_CLIENT_CHAR_CONFIG_DESC, # 1,2,3,4.
+                  GAP_SERV, DEVICE_NAME_CHAR, APPEARANCE_CHAR, PERIPHERAL_PRIVACY_CHAR, # 5,6,7,8.
+                  GATT_SERV, SERVICE_CHANGED_CHAR, GATT_CLIENT_CHAR_CONFIG_DESC, # 9,10,11.
+                  DEVICE_INFORMATION_SERV, SYSTEM_ID_CHAR, MODEL_NUMBER_STR_CHAR, SERIAL_NUMBER_STR_CHAR, # 12,13,14,15.
+                  FIRMWARE_REV_STR_CHAR, HARDWARE_REV_STR_CHAR, SOFTWARE_REV_STR_CHAR, # 16,17,18.
+                  MANUFACTURER_STR_CHAR, IEEE_REGULATORY_LIST_CHAR, PLUGNPLAY_ID_CHAR, # 19,20,21.
+                  UNKNOWN_SERV, UNKNOWN_CHAR_1, UNKNOWN_DESC_1, UNKNOWN_DESC_2, UNKNOWN_CHAR_2, UNKNOWN_DESC_3, UNKNOWN_DESC_4) # 22,23,24,25,26,27,28.
+
     def __init__(self): 
-        self.bluetooth_address = '' # Address is unique to each Cube. All other values are the same for all Cubes.
-
-        self.CIRCUITCUBE_SERV = '6e400001-b5a3-f393-e0a9-e50e24dcca9e'
-        self.TX_CHAR = '6e400002-b5a3-f393-e0a9-e50e24dcca9e' # Write-without-response. 
-        self.RX_CHAR = '6e400003-b5a3-f393-e0a9-e50e24dcca9e' # Notify. 
-        self.RX_CLIENT_CHAR_CONFIG_DESC = '00002902-0000-1000-8000-00805f9b34fb' # Handle 34. 
-
-        self.GAP_SERV = '00001800-0000-1000-8000-00805f9b34fb'
-        self.DEVICE_NAME_CHAR = '00002a00-0000-1000-8000-00805f9b34fb' # Read. 
-        self.APPEARANCE_CHAR = '00002a01-0000-1000-8000-00805f9b34fb' # Read. 
-        self.PERIPHERAL_PRIVACY_CHAR = '00002a02-0000-1000-8000-00805f9b34fb' # Read. 
-
-        self.GATT_SERV = '00001801-0000-1000-8000-00805f9b34fb' 
-        self.SERVICE_CHANGED_CHAR = '00002a05-0000-1000-8000-00805f9b34fb' # Indicate. 
-        self.GATT_CLIENT_CHAR_CONFIG_DESC = '00002902-0000-1000-8000-00805f9b34fb' # Handle 11. 
-
-        self.DEVICE_INFORMATION_SERV = '0000180a-0000-1000-8000-00805f9b34fb'
-        self.SYSTEM_ID_CHAR = '00002a23-0000-1000-8000-00805f9b34fb' # Read. 
-        self.MODEL_NUMBER_STR_CHAR = '00002a24-0000-1000-8000-00805f9b34fb' # Read. 
-        self.SERIAL_NUMBER_STR_CHAR = '00002a25-0000-1000-8000-00805f9b34fb' # Read. 
-        self.FIRMWARE_REV_STR_CHAR = '00002a26-0000-1000-8000-00805f9b34fb' # Read. 
-        self.HARDWARE_REV_STR_CHAR = '00002a27-0000-1000-8000-00805f9b34fb' # Read. 
-        self.SOFTWARE_REV_STR_CHAR = '00002a28-0000-1000-8000-00805f9b34fb' # Read. 
-        self.MANUFACTURER_STR_CHAR = '00002a29-0000-1000-8000-00805f9b34fb' # Read. 
-        self.IEEE_REGULATORY_LIST_CHAR = '00002a2a-0000-1000-8000-00805f9b34fb' # Read. 
-        self.PLUGNPLAY_ID_CHAR = '00002a50-0000-1000-8000-00805f9b34fb' # Read. 
-
-        self.UNKNOWN_SERV = 'f000ffc0-0451-4000-b000-000000000000'
-        self.UNKNOWN_CHAR_1 = 'f000ffc1-0451-4000-b000-000000000000' # write-without-response, write, notify. 
-        self.UNKNOWN_DESC_1 = '00002902-0000-1000-8000-00805f9b34fb' # Handle 4099.
-        self.UNKNOWN_DESC_2 = '00002901-0000-1000-8000-00805f9b34fb' # Handle: 4100.
-        self.UNKNOWN_CHAR_2 = 'f000ffc2-0451-4000-b000-000000000000' # write-without-response, write, notify. 
-        self.UNKNOWN_DESC_3 = '00002902-0000-1000-8000-00805f9b34fb' # Handle 4103. 
-        self.UNKNOWN_DESC_4 = '00002901-0000-1000-8000-00805f9b34fb' # Handle: 4104.
-
-        self.constantsList = [self.bluetooth_address, # 0.
-                         self.CIRCUITCUBE_SERV, self.TX_CHAR, self.RX_CHAR, self.RX_CLIENT_CHAR_CONFIG_DESC, # 1,2,3,4.
-                         self.GAP_SERV, self.DEVICE_NAME_CHAR, self.APPEARANCE_CHAR, self.PERIPHERAL_PRIVACY_CHAR, # 5,6,7,8.
-                         self.GATT_SERV, self.SERVICE_CHANGED_CHAR, self.GATT_CLIENT_CHAR_CONFIG_DESC, # 9,10,11.
-                         self.DEVICE_INFORMATION_SERV, self.SYSTEM_ID_CHAR, self.MODEL_NUMBER_STR_CHAR, self.SERIAL_NUMBER_STR_CHAR, # 12,13,14,15.
-                         self.FIRMWARE_REV_STR_CHAR, self.HARDWARE_REV_STR_CHAR, self.SOFTWARE_REV_STR_CHAR, # 16,17,18.
-                         self.MANUFACTURER_STR_CHAR, self.IEEE_REGULATORY_LIST_CHAR, self.PLUGNPLAY_ID_CHAR, # 19,20,21.
-                         self.UNKNOWN_SERV, self.UNKNOWN_CHAR_1, self.UNKNOWN_DESC_1, self.UNKNOWN_DESC_2, self.UNKNOWN_CHAR_2, self.UNKNOWN_DESC_3, self.UNKNOWN_DESC_4] # 22,23,24,25,26,27,28.
+        self.bluetooth_address = '' # Address is unique to each Cube. All other values are the same for all Cubes and live on the class. 
 
     def get_constant(self, index): # Index ranges from 0 to 28 since there are 29 items. 
-        return self.constantsList[index] 
+        if index == 0: 
+            return self.bluetooth_address
+        return self._CONSTANTS[index] 
     
     def set_address(self, address): # Sets BLUETOOTH_ADDRESS constant. 
         self.bluetooth_address = address
 
     def __len__(self): # Returns total number of constants. 
-        return len(self.constantsList)
+        return len(self._CONSTANTS)
+
+_LETTER_TO_IDX = {'A': 0, 'B': 1, 'C': 2} # Motor letter to motor index. 
+_SUFFIX = (b'a', b'b', b'c') # Motor index to the letter ending each motor command. 
+
+def _build_motor_command(letter, velocity): # Build encoded motor command from motor letter and velocity. 
+                                            # Only used to fill _CMD_CACHE when the module is imported, always with valid inputs. 
+                                            # Input is validated by Cube.motor_command, which looks commands up in _CMD_CACHE. 
+    motor = _LETTER_TO_IDX[letter]
+    sign = b'-' if velocity < 0 else b'+'
+    magnitude = 55+abs(velocity) if velocity else 0 # Add to 55 since motor does nothing below 55. 
+    return b'%c%03d%s' % (sign, magnitude, _SUFFIX[motor]) # Nominal/theoretical velocity range is -255 to 255. 
+
+_CMD_CACHE = {(letter, velocity): _build_motor_command(letter, velocity) # Every possible motor command, already encoded. 
+              for letter in ('A', 'B', 'C') for velocity in range(-100, 101)}
+
+_BATTERY_QUERY = b'b' # Command that makes the Cube reply with its battery voltage on RX. 
+
+_LOOP = None # Event loop shared by every Cube outside Jupyter, so cubes connected on it can be used together. 
+
+def _shared_loop(use_uvloop): # Create the shared loop the first time it is needed. 
+    global _LOOP
+    if _LOOP is None or _LOOP.is_closed(): 
+        _LOOP = uvloop.new_event_loop() if use_uvloop else asyncio.new_event_loop() # uvloop lowers scheduling overhead around each BLE call. 
+    return _LOOP
 
 class Cube: # Main class of package. Most methods are made of two functions, once with the prefix "async_". 
             # This is because of how the class manages asynchronous code while making it appear synchronous outside of the package. 
 
     __version__ = '1.1.3' # Remember to update. 
 
+    _ATTEMPTS = 3 # Number of tries for connecting and for reading characteristics. 
+
+    _HALT_BYTES = b''.join(_CMD_CACHE[(letter, 0)] for letter in ('A', 'B', 'C')) # b'+000a+000b+000c', never changes. 
+
     def __init__(self, **kwargs): 
         try: 
             self.verbose = kwargs.get('verbose', True) # Verbose by default. 
             self.address = kwargs.get('address', '')
-            self.jupyter = kwargs.get('jupyter', False) # Jupyter defaults to False, but can be overridden by the user. 
-            self.jupyter = not(get_ipython() is None) # If get_ipython exists, then the inside of not() is false. 
+            self.jupyter = kwargs.get('jupyter', _IN_JUPYTER) # Jupyter is detected at import, but can be overridden by the user. 
             print(self.verbose * self.jupyter * '\nRunning in Jupyter notebook. ')
             self.constants_class = Constants() # Initialize Constants class. 
             self.constants = self.constants_class.get_constant # Constants.get_constant is used to retrieve constants. 
-            self.platform() 
+            self._TX = self.constants_class.TX_CHAR # TX and RX are used by almost every method, so avoid get_constant for them. 
+            self._RX = self.constants_class.RX_CHAR
+            self.platform() # Must come before creating the loop, since it decides whether to use uvloop. 
+            self._loop = None
+            self._conn_params_request = None # Windows only, closed on disconnect. 
+            if self.jupyter: 
+                try: 
+                    self._loop = asyncio.get_running_loop() # Notebook's loop is already running. 
+                    nest_asyncio.apply(self._loop) # Only needs to be applied once, allows running the notebook's loop re-entrantly. 
+                except RuntimeError: # E.g. jupyter=True outside a notebook, or a plain IPython shell. 
+                    pass
+            if self._loop is None: 
+                self._loop = _shared_loop(self._use_uvloop) # Every call runs on this one loop, so the bleak client and its notifications stay on it. 
             self.connect(self.address)
         except Exception as e: 
             print(f'\n{e}')
@@ -91,12 +142,16 @@ class Cube: # Main class of package. Most methods are made of two functions, onc
     def platform(self): 
         try: 
             self.platform = 'Other.'
+            self._use_uvloop = False # Jupyter already has a running loop, and nest_asyncio cannot patch uvloop. 
             if sys.platform == 'linux': 
                 self.platform = 'Linux'
+                self._use_uvloop = uvloop is not None and not self.jupyter
             elif sys.platform == "darwin":
                 self.platform = 'macOS'
-                asyncio.set_event_loop_policy(asyncio.DefaultEventLoopPolicy()) # This is because of macOS's weird behaviour.   
-                                                                                # Core Bluetooth does not like interacting with asyncio.
+                self._use_uvloop = uvloop is not None and not self.jupyter
+                if not self._use_uvloop: 
+                    asyncio.set_event_loop_policy(asyncio.DefaultEventLoopPolicy()) # This is because of macOS's weird behaviour.   
+                                                                                    # Core Bluetooth does not like interacting with asyncio.
             elif sys.platform == 'win32': 
                 self.platform = 'Windows'
             print(self.verbose * f'\nPlatform is {self.platform}. ')
@@ -110,11 +165,10 @@ class Cube: # Main class of package. Most methods are made of two functions, onc
                 self.client = BleakClient(address)
             else: 
                 print(self.verbose * '\nScanning for Circuit Cube. ')
-                scanner = BleakScanner()
-                await scanner.start()
-                device = await scanner.find_device_by_name('Tenka') # Search for BLE device with name "Tenka". 
+                device = await BleakScanner.find_device_by_name('Tenka', timeout=10) # Search for BLE device with name "Tenka". 
+                                                                                      # Returns as soon as it is seen, rather than after a full scan. 
                 if device is None: 
-                    print('\nNo Circuit Cube device found. ')
+                    raise ConnectionError('No Circuit Cube device found. ')
                 address = device.address # Get device using bleak address attribute. 
                                          # This is more reliable than prior approach using string operations. 
                                          # When running on macOS, this address is a 128-bit UUID because of Core Bluetooth. 
@@ -122,19 +176,60 @@ class Cube: # Main class of package. Most methods are made of two functions, onc
                 self.client = BleakClient(address)
             self.address = address
             self.constants_class.set_address(self.address) # Update BLUETOOTH_ADDRESS constant in the Constants class. 
-            await self.client.connect()
+            for attempt in range(self._ATTEMPTS): # Retry transient BLE errors (interference, distance) with exponential backoff. 
+                try: 
+                    await self.client.connect()
+                    break
+                except (BleakError, TimeoutError) as e: 
+                    if attempt == self._ATTEMPTS-1: 
+                        raise
+                    print(self.verbose * f'\nConnection failed ({e}), retrying. ')
+                    await asyncio.sleep(0.5*2**attempt)
+            self._request_connection_parameters()
+            try: 
+                await self.client._backend._acquire_mtu() # BlueZ only. Without this, bleak reports the default MTU of 23 on Linux. 
+            except Exception: # Other backends have no such method and negotiate the MTU themselves. 
+                pass
+            self.mtu_payload = self.client.mtu_size - 3 # 3 bytes of ATT header per write. 
+            print(self.verbose * f'\nMTU payload size is {self.mtu_payload} bytes. ')
+            services = self.client.services # Resolve characteristics once, so bleak does not look up each UUID on every call. 
+            self._tx_char = services.get_characteristic(self._TX)
+            self._rx_char = services.get_characteristic(self._RX)
+            self._info_chars = [services.get_characteristic(self.constants(index)) for index in (6, 7, 15, 16, 17, 18)] # Used by information method. 
+            self._rx_event = asyncio.Event()
+            await self.client.start_notify(self._rx_char, self._rx_callback) # Replies to queries such as battery voltage arrive on RX. 
 
-    def connect(self, address=''): # A similar approach is used for almost every other method in the Cube class. 
-                                   # Based on whether runnign in interactive Python, change how asychronous code is run. 
+    def _request_connection_parameters(self): # Ask for a shorter connection interval, since BLE latency is mostly set by it. 
+                                              # Only Windows lets applications request this. BlueZ has no D-Bus method for it, 
+                                              # and Core Bluetooth gives no control over connection parameters. 
+        self._close_connection_parameters() # Calling connect again must not leave the previous request open. 
+        if self.platform != 'Windows': 
+            return
         try: 
-            if self.jupyter: 
-                nest_asyncio.apply()
-                loop = asyncio.get_event_loop()
-                if loop.is_running(): 
-                    task = asyncio.create_task(self.async_connect(address))
-                    return loop.run_until_complete(asyncio.gather(task)) 
+            from winrt.windows.devices.bluetooth import ( # Installed with bleak on Windows. 
+                BluetoothLEPreferredConnectionParameters, BluetoothLEPreferredConnectionParametersRequestStatus)
+            device = self.client._backend._requester # Private bleak attribute, may change between versions. 
+            parameters = BluetoothLEPreferredConnectionParameters.throughput_optimized
+            self._conn_params_request = device.request_preferred_connection_parameters(parameters) # Only applies while kept open. 
+            if self._conn_params_request.status == BluetoothLEPreferredConnectionParametersRequestStatus.SUCCESS: 
+                print(self.verbose * '\nRequested throughput optimized connection parameters. ')
             else: 
-                asyncio.run(self.async_connect(address))
+                print(self.verbose * f'\nConnection parameter request was not accepted ({self._conn_params_request.status}). ')
+        except Exception as e: # Requires Windows 11, otherwise keep whatever the Cube negotiated. 
+            print(self.verbose * f'\nCould not request connection parameters ({e}). ')
+
+    def _close_connection_parameters(self): # Release the preferred connection parameters on Windows, if requested. 
+        if self._conn_params_request is not None: 
+            self._conn_params_request.close()
+            self._conn_params_request = None
+
+    def _run_sync(self, coro): # Every synchronous method in the Cube class runs its "async_" counterpart through here. 
+                               # In Jupyter, this works on the already running loop because of nest_asyncio. 
+        return self._loop.run_until_complete(coro)
+
+    def connect(self, address=''): # See _run_sync. 
+        try: 
+            return self._run_sync(self.async_connect(address))
         except Exception as e:
             print(f'\n{e}')
             raise
@@ -142,91 +237,64 @@ class Cube: # Main class of package. Most methods are made of two functions, onc
     async def async_information(self): # Print information about Circuit Cube device to terminal. 
         print('\nDevice information: ')
     
-        device_name = await self.client.read_gatt_char(self.constants(6)) 
-        device_name = device_name.decode('utf-8')
-        print(f'    Name: {device_name}. ') # Device name. 
+        values = await asyncio.gather(*(self._async_read(char) for char in self._info_chars)) # Reads are independent, so issue them together. 
+        labels = ('Name', 'Appearance code', 'Serial number', 'Firmware', 'Hardware', 'Software')
 
-        device_appearance = await self.client.read_gatt_char(self.constants(7)) 
-        device_appearance = int.from_bytes(device_appearance, 'big')
-        print(f'    Appearance code: {device_appearance}. ') # Device appearance. 
+        for label, value in zip(labels, values): # One unreadable characteristic should not abort the rest. 
+            if value is None: 
+                value = 'unavailable'
+            elif label == 'Appearance code': 
+                value = int.from_bytes(value, 'big')
+            else: 
+                value = value.decode('utf-8')
+            print(f'    {label}: {value}. ')
 
-        serial_number = await self.client.read_gatt_char(self.constants(15)) 
-        serial_number = serial_number.decode('utf-8')
-        print(f'    Serial number: {serial_number}. ') # Serial number. 
-        
-        firmware = await self.client.read_gatt_char(self.constants(16)) 
-        firmware = firmware.decode('utf-8')
-        print(f'    Firmware: {firmware}. ') # Firmware version. 
-
-        hardware = await self.client.read_gatt_char(self.constants(17)) 
-        hardware = hardware.decode('utf-8')
-        print(f'    Hardware: {hardware}. ') # Hardware version. 
-
-        software = await self.client.read_gatt_char(self.constants(18)) 
-        software = software.decode('utf-8')
-        print(f'    Software: {software}. ') # Software version. 
-
-        TX = self.constants(2) 
-        RX = self.constants(3)
-        await self.client.write_gatt_char(TX, bytes('b', 'utf-8'))
-        voltage = await self.client.read_gatt_char(RX)
-        print(f'    Battery voltage: {voltage.decode("utf-8")}. ')
+        voltage = await self._async_query(_BATTERY_QUERY)
+        print(f'    Battery voltage: {voltage}. ')
             
-    def information(self): # See line 124. 
+    async def _async_read(self, char): # Read characteristic, retrying transient BLE errors a few times. 
+                                       # Returns None if it still cannot be read, or was not found at connect. 
+        if char is None: 
+            return None
+        for attempt in range(self._ATTEMPTS): 
+            try: 
+                return await self.client.read_gatt_char(char)
+            except (BleakError, TimeoutError) as e: 
+                print(self.verbose * f'\nFailed to read {char} ({e}). ')
+                if attempt < self._ATTEMPTS-1: # No point waiting after the last attempt. 
+                    await asyncio.sleep(0.1*2**attempt)
+        return None
+
+    def information(self): # See _run_sync. 
         try:  
-            if self.jupyter: 
-                nest_asyncio.apply()
-                loop = asyncio.get_event_loop()
-                if loop.is_running(): 
-                    task = asyncio.create_task(self.async_information())
-                    return loop.run_until_complete(asyncio.gather(task)) 
-            else: 
-                asyncio.run(self.async_information())
+            return self._run_sync(self.async_information())
         except Exception as e: 
             print(f'\n{e}')
             raise
 
-    def motor_command(self, letter, velocity): # Build motor command from motor letter and velocity. 
+    def motor_command(self, letter, velocity): # Look up encoded motor command from motor letter and velocity. 
                                                # Letter must be "A", "B", "C". 
                                                # Velocity must be within -100 to 100. 
-        if letter == 'A': 
-            motor = 0 
-        elif letter == 'B': 
-            motor = 1
-        elif letter == 'C': 
-            motor = 2
-        sign = '-' if velocity < 0 else '+'
-        magnitude = abs(velocity*2)
-        magnitude = math.ceil(magnitude) # Round up magnitude. 
-        if magnitude > 200: 
-            raise ValueError('\nVelocity must be between 0 and 100. ')
-        if magnitude == 0: 
-            magnitude = 0
-        else: 
-            magnitude = 55+abs(velocity) # Add to 55 since motor does nothing below 55. 
-        command_string = f'{sign}{magnitude:03}{chr(ord('a') + motor)}' # Nominal/theoretical velocity range is -255 to 255. 
-        print(self.verbose * f'\nCommand string: {command_string}. ')
-        return command_string
+        try: 
+            command = _CMD_CACHE[(letter, velocity)]
+        except KeyError: 
+            raise ValueError(f'\nLetter must be "A", "B", or "C", and velocity must be a whole number between -100 and 100, '
+                             f'got letter {letter!r} and velocity {velocity!r}. ') from None
+        if self.verbose: 
+            print(f'\nCommand string: {command.decode()}. ')
+        return command
     
     async def async_run_motor(self, letter, velocity, time, **kwargs): # Requires motor letter, velocity, and time arguments. 
                                                                        # If keyword argument smooth is true, then don't stop motor. 
         smooth = kwargs.get('smooth', False)
-        TX = self.constants(2) 
-        await self.client.write_gatt_char(TX, self.motor_command(letter, velocity).encode())
+        await self.client.write_gatt_char(self._tx_char, self.motor_command(letter, velocity), response=False)
         await asyncio.sleep(time)
         if not smooth: 
-            await self.client.write_gatt_char(TX, self.motor_command(letter, 0).encode()) # Stop motor after elapsed time. 
+            await self.client.write_gatt_char(self._tx_char, self.motor_command(letter, 0), response=False) # Stop motor after elapsed time. 
 
-    def run_motor(self, letter, velocity, time, **kwargs): # See line 124. 
+    def run_motor(self, letter, velocity, time, **kwargs): # See _run_sync. 
         try: 
-            if self.jupyter: 
-                nest_asyncio.apply()
-                loop = asyncio.get_event_loop()
-                if loop.is_running(): 
-                    task = asyncio.create_task(self.async_run_motor(letter, velocity, time, **kwargs))
-                    return loop.run_until_complete(asyncio.gather(task))
-            else: 
-                asyncio.run(self.async_run_motor(letter, velocity, time, **kwargs))
+            return self._run_sync(self.async_run_motor(letter, velocity, time, **kwargs))
         except Exception as e: 
             print(f'\n{e}')
             raise
@@ -234,63 +302,78 @@ class Cube: # Main class of package. Most methods are made of two functions, onc
     async def async_run_motors(self, letters, velocities, time, **kwargs): # Very similar to run_motor method. 
                                                                            # Input arguments letter and velocities are lists. 
         smooth = kwargs.get('smooth', False)
-        TX = self.constants(2)
-        for letter, velocity in zip(letters, velocities): 
-            command = self.motor_command(letter, velocity)
-            await self.client.write_gatt_char(TX, command.encode())
+        await self._async_write_commands([self.motor_command(letter, velocity) for letter, velocity in zip(letters, velocities)])
         await asyncio.sleep(time)
         if not smooth: 
-            for letter in letters: 
-                command = self.motor_command(letter, 0)
-                await self.client.write_gatt_char(TX, command.encode())
+            await self._async_write_commands([self.motor_command(letter, 0) for letter in letters])
+
+    async def _async_write_commands(self, commands): # Write several motor commands at once, since the Cube accepts concatenated command strings. 
+                                                     # Commands are only split across writes if they do not fit within the ATT MTU. 
+        TX, write = self._tx_char, self.client.write_gatt_char # Look up attributes once, outside the loop. 
+        payload = b''.join(commands)
+        step = max(5, self.mtu_payload // 5 * 5) # Each motor command is 5 bytes, so split on whole commands. 
+        for i in range(0, len(payload), step): 
+            await write(TX, payload[i:i+step], response=False)
 
-    def run_motors(self, letters, velocities, time, **kwargs): # See line 124. 
+    def run_motors(self, letters, velocities, time, **kwargs): # See _run_sync. 
         try: 
-            if self.jupyter: 
-                nest_asyncio.apply()
-                loop = asyncio.get_event_loop()
-                if loop.is_running(): 
-                    task = asyncio.create_task(self.async_run_motors(letters, velocities, time, **kwargs))
-                    return loop.run_until_complete(asyncio.gather(task))
-            else: 
-                asyncio.run(self.async_run_motors(letters, velocities, time, **kwargs))
+            return self._run_sync(self.async_run_motors(letters, velocities, time, **kwargs))
+        except Exception as e: 
+            print(f'\n{e}')
+            raise
+
+    async def async_run_sequence(self, steps, *cubes, **kwargs): # Requires list of (letters, velocities, time) steps, run one after another. 
+                                                                 # Any additional cubes run the same steps at the same time as this one. 
+                                                                 # If keyword argument smooth is true, then don't stop motors after the last step. 
+        smooth = kwargs.get('smooth', False)
+        payloads = [[self.motor_command(letter, velocity) for letter, velocity in zip(letters, velocities)] # Built and validated up front, 
+                    for letters, velocities, time in steps]                                                 # so a bad step fails before any motor moves. 
+        times = [time for letters, velocities, time in steps]
+        letters_used = dict.fromkeys(letter for letters, velocities, time in steps for letter in letters) # Ordered and without repeats. 
+        stop = [self.motor_command(letter, 0) for letter in letters_used] # Only stop motors the sequence uses, like run_motors. 
+        if not cubes: 
+            await self._async_play(payloads, times, stop, smooth)
+            return
+        if any(cube._loop is not self._loop for cube in cubes): # Each bleak client only works on the loop it connected on. 
+            raise ValueError('\nAll cubes must be created in the same environment, either all in a Jupyter notebook or all outside one. ')
+        async with asyncio.TaskGroup() as group: # If one cube fails, the others are cancelled, which stops their motors. 
+            for cube in (self, *cubes): 
+                group.create_task(cube._async_play(payloads, times, stop, smooth))
+
+    async def _async_play(self, payloads, times, stop, smooth): # Write already built steps, then stop motors unless smooth. 
+        try: 
+            for commands, time in zip(payloads, times): # Each step is one batched write, queued without response, then a sleep. 
+                await self._async_write_commands(commands)
+                await asyncio.sleep(time)
+        except BaseException: # Failed or cancelled part way through, so never leave the motors running. 
+            await self._async_write_commands(stop)
+            raise
+        if not smooth: 
+            await self._async_write_commands(stop)
+
+    def run_sequence(self, steps, *cubes, **kwargs): # See _run_sync. 
+        try: 
+            return self._run_sync(self.async_run_sequence(steps, *cubes, **kwargs))
         except Exception as e: 
             print(f'\n{e}')
             raise
 
     async def async_halt(self): # Halts all motors. 
         print(self.verbose * f'\nStopping all motors. ')
-        TX = self.constants(2)
-        for letter in ['A', 'B', 'C']: 
-            command = self.motor_command(letter, 0)
-            await self.client.write_gatt_char(TX, command.encode())
+        await self.client.write_gatt_char(self._tx_char, self._HALT_BYTES, response=False) # Stop all three motors with one write. 
 
-    def halt(self): # See line 124. 
+    def halt(self): # See _run_sync. 
         try: 
-            if self.jupyter: 
-                nest_asyncio.apply()
-                loop = asyncio.get_event_loop()
-                if loop.is_running(): 
-                    task = asyncio.create_task(self.async_halt())
-                    return loop.run_until_complete(asyncio.gather(task))
-            else: 
-                asyncio.run(self.async_halt())
+            return self._run_sync(self.async_halt())
         except Exception as e: 
             print(f'\n{e}')
             raise
 
     def disconnect(self): # Disconnects Circuit Cube use bleak disconnect method. 
-                          # Implementation not the most reliable in non-interactive Python. 
         try: 
-            if self.jupyter: 
-                print(self.verbose * '\nDisconnecting Circuit Cube. ')
-                nest_asyncio.apply()
-                loop = asyncio.get_event_loop()
-                if loop.is_running(): 
-                    task = asyncio.create_task(self.client.disconnect())
-                    return loop.run_until_complete(asyncio.gather(task))
-            else: 
-                print(self.verbose * '\nDisconnecting Circuit Cube. ')
+            print(self.verbose * '\nDisconnecting Circuit Cube. ')
+            self._close_connection_parameters()
+            return self._run_sync(self.client.disconnect())
         except Exception as e: 
             print(f'\n{e}')
             raise
@@ -307,25 +390,25 @@ class Cube: # Main class of package. Most methods are made of two functions, onc
     def help(self): # Print link to project GitHub page in terminal. 
         print('\n Visit https://github.com/simon-code-git/circuitcubes. ')
 
+    def _rx_callback(self, sender, data): # Called by bleak whenever the Cube notifies on the RX characteristic. 
+        self._rx_data = bytes(data)
+        self._rx_event.set()
+
+    async def _async_query(self, command, timeout=1.0): # Write command to TX and wait for the Cube's reply on RX. 
+                                                       # Uses notifications rather than a separate read, which saves a BLE round-trip. 
+        self._rx_event.clear() # Ignore any earlier notification. The event and RX subscription live on the Cube's one loop. 
+        await self.client.write_gatt_char(self._tx_char, command, response=False) # TX is write-without-response. 
+        await asyncio.wait_for(self._rx_event.wait(), timeout)
+        return self._rx_data.decode('utf-8').rstrip('\x00')
+
     async def async_battery(self): # Get battery voltage. 
-        TX = self.constants(2) 
-        RX = self.constants(3)
-        await self.client.write_gatt_char(TX, bytes('b', 'utf-8'))
-        voltage = await self.client.read_gatt_char(RX)
-        self.voltage = voltage.decode('utf-8').rstrip('\x00')
+        self.voltage = await self._async_query(_BATTERY_QUERY)
         print(self.verbose * f'\nBattery voltage is {self.voltage}. ')
         return self.voltage
 
-    def battery(self): # See line 124. 
+    def battery(self): # See _run_sync. 
         try: 
-            if self.jupyter: 
-                nest_asyncio.apply()
-                loop = asyncio.get_event_loop()
-                if loop.is_running(): 
-                    task = asyncio.create_task(self.async_battery())
-                    return loop.run_until_complete(asyncio.gather(task))
-            else: 
-                asyncio.run(self.async_battery())
+            return self._run_sync(self.async_battery())
         except Exception as e: 
             print(f'\n{e}')
             raise 